@@ -1,22 +1,91 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Path, Body
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, DateTime, func
-from sqlalchemy.orm import Session, sessionmaker, relationship
-from datetime import datetime, timedelta
+from fastapi import FastAPI, Depends, HTTPException, Query, Path, Body, Response
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
+from fastapi_cache.key_builder import default_key_builder
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Index, UniqueConstraint, func, select, case, event, text, bindparam, insert, update, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from contextlib import asynccontextmanager
+from functools import wraps
+from datetime import date, datetime, timedelta
+import itertools
 from typing import List, Optional
 from sqlalchemy.ext.declarative import declarative_base
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# Prepare the database and the response cache for the analytics endpoints on startup.
+# On shutdown, refresh SQLite's planner statistics once and close pooled connections so aiosqlite's worker threads can exit.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.run_sync(init_sqlite_file)
+        async with engine.begin() as connection:
+            await connection.run_sync(init_db)
+        FastAPICache.init(InMemoryBackend(), prefix="forsit")
+        yield
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql("PRAGMA optimize")
+    finally:
+        # Also runs when startup fails, so a failed boot does not hang on open connections
+        await engine.dispose()
 
 # Create a FastAPI application
-app = FastAPI()
+# Responses are encoded with orjson, which is considerably faster than the stdlib json encoder on large lists
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Revenue responses are cached per query and per cache generation
+REVENUE_CACHE_NAMESPACE = "revenue"
+REVENUE_CACHE_EXPIRE = 3600
+
+# Part of every revenue cache key and bumped whenever sales are recorded. A revenue request that read the rollup
+# before a sale committed stores its result under the old generation, so it is never served once the sale is in.
+revenue_cache_generation = 0
+
+# Move revenue caching to a new generation after sales are committed
+async def invalidate_revenue_cache():
+    global revenue_cache_generation
+    revenue_cache_generation += 1
+    # The in-memory backend only evicts entries when they are read, so drop the old generation's entries explicitly
+    await FastAPICache.clear(namespace=REVENUE_CACHE_NAMESPACE)
 
 # Define the database connection URL (replace with your actual database URL)
-DATABASE_URL = "sqlite:///./forsit.db"
+DATABASE_URL = "sqlite+aiosqlite:///./forsit.db"
 
 # Create a database engine
-engine = create_engine(DATABASE_URL)
+# The endpoints issue a small, fixed set of statement shapes, so a generous compiled-statement cache keeps them all warm.
+# aiosqlite defaults to NullPool, so pool connections explicitly: each connection is opened and has the pragmas below
+# applied once, then lives for the whole process. A shared StaticPool connection would interleave the transactions
+# of concurrent requests, whereas a pool lets WAL serve several readers alongside the writer.
+engine = create_async_engine(
+    DATABASE_URL,
+    query_cache_size=1200,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=0,
+    pool_recycle=-1,
+    pool_pre_ping=False,
+)
+
+# Tune SQLite on every new connection: the database runs in WAL mode (see init_sqlite_file), where
+# synchronous=NORMAL skips the fsync on each commit safely
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
 
 # Create a session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit, so endpoints can return them without awaiting a refresh
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 # Define the base model for SQLAlchemy
 Base = declarative_base()
@@ -33,7 +102,17 @@ class ProductCreate(ProductBase):
     category_id: int
 
 class ProductResponse(ProductBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+
+# Product listings leave out the description, which can be large
+class ProductListResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
+    name: str
+    price: float
 
 # Pydantic models for Sale
 class SaleBase(BaseModel):
@@ -45,6 +124,8 @@ class SaleCreate(SaleBase):
     category_id: int
 
 class SaleResponse(SaleBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     sale_date: datetime
 
@@ -56,17 +137,16 @@ class InventoryBase(BaseModel):
 class InventoryCreate(InventoryBase):
     category_id: int
 
+class InventoryUpdate(BaseModel):
+    stock_quantity: int
+
 class InventoryResponse(InventoryBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     last_updated: datetime
 
 # Pydantic models for Revenue Analysis
-class RevenueQueryParams(BaseModel):
-    start_date: datetime
-    end_date: datetime
-    product_id: Optional[int] = None
-    category_id: Optional[int] = None
-
 class RevenueAnalysis(BaseModel):
     period: str
     revenue: float
@@ -79,9 +159,15 @@ class CategoryCreate(CategoryBase):
     pass
 
 class CategoryResponse(CategoryBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
 
 # Define database models for Product, Sale, Inventory, and Category
+# No response model serializes a category or its collections, so those relationships refuse to lazy load.
+# Load them explicitly where they are needed: joinedload for a single related object (e.g. Sale.category),
+# selectinload for collections (e.g. Category.products), which issues one extra "WHERE fk IN (...)" SELECT
+# per relationship instead of joining several collections into a cartesian product.
 
 class Product(Base):
     __tablename__ = "products"
@@ -90,7 +176,7 @@ class Product(Base):
     description = Column(String)
     price = Column(Float)
     category_id = Column(Integer, ForeignKey("categories.id"))
-    category = relationship("Category", back_populates="products")
+    category = relationship("Category", back_populates="products", lazy="raise_on_sql")
 
 class Sale(Base):
     __tablename__ = "sales"
@@ -100,7 +186,15 @@ class Sale(Base):
     revenue = Column(Float)
     sale_date = Column(DateTime, default=func.now())
     category_id = Column(Integer, ForeignKey("categories.id"))
-    category = relationship("Category", back_populates="sales")
+    category = relationship("Category", back_populates="sales", lazy="raise_on_sql")
+
+    # Fetch the server-side sale_date default with RETURNING on insert instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Covers the sale_date range + category/product filters used by the sales and revenue endpoints
+    __table_args__ = (
+        Index("ix_sales_date_cat_prod", "sale_date", "category_id", "product_id"),
+    )
 
 class Inventory(Base):
     __tablename__ = "inventory"
@@ -109,26 +203,103 @@ class Inventory(Base):
     stock_quantity = Column(Integer)
     last_updated = Column(DateTime, default=func.now())
     category_id = Column(Integer, ForeignKey("categories.id"))
-    category = relationship("Category", back_populates="inventory")
+    category = relationship("Category", back_populates="inventory", lazy="raise_on_sql")
+
+    # One inventory row per product; declared as a unique index so it can be added to existing tables
+    __table_args__ = (
+        Index("uq_inventory_product_id", "product_id", unique=True),
+    )
+
+# Revenue per product and category per calendar day, kept up to date as sales are recorded
+class SalesDailyRollup(Base):
+    __tablename__ = "sales_daily_rollup"
+    id = Column(Integer, primary_key=True, index=True)
+    sale_date_day = Column(Date, nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("sale_date_day", "product_id", "category_id"),
+        Index("ix_sales_daily_rollup_day_cat_prod", "sale_date_day", "category_id", "product_id"),
+    )
 
 class Category(Base):
     __tablename__ = "categories"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True)
-    products = relationship("Product", back_populates="category")
-    sales = relationship("Sale", back_populates="category")
-    inventory = relationship("Inventory", back_populates="category")
+    products = relationship("Product", back_populates="category", lazy="raise_on_sql")
+    sales = relationship("Sale", back_populates="category", lazy="raise_on_sql")
+    inventory = relationship("Inventory", back_populates="category", lazy="raise_on_sql")
+
+# Configure the database file itself on startup, outside any transaction.
+# page_size is only raised for a brand-new, empty database: changing it on an existing one would need a full VACUUM
+# rewrite. WAL lets readers run alongside the writer and persists in the file once enabled.
+def init_sqlite_file(connection):
+    if connection.exec_driver_sql("SELECT count(*) FROM sqlite_master").scalar() == 0:
+        connection.exec_driver_sql("PRAGMA page_size=8192")
+    connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+# Create the database tables, run on startup through the async engine
+def init_db(connection):
+    Base.metadata.create_all(bind=connection)
+
+    # The unique inventory index cannot be built over duplicate rows, so fail with a clear message instead
+    if "uq_inventory_product_id" not in {index["name"] for index in inspect(connection).get_indexes("inventory")}:
+        duplicate_product_ids = connection.execute(
+            select(Inventory.product_id)
+            .where(Inventory.product_id.is_not(None))
+            .group_by(Inventory.product_id)
+            .having(func.count() > 1)
+        ).scalars().all()
+        if duplicate_product_ids:
+            raise RuntimeError(
+                f"inventory has more than one row for product(s) {duplicate_product_ids}; "
+                "merge or delete the duplicates so uq_inventory_product_id can be created"
+            )
+
+    # Add indexes missing from tables created before they were declared
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+    # Backfill the daily rollup from sales recorded before it existed
+    if connection.execute(select(SalesDailyRollup.id).limit(1)).first() is None:
+        connection.execute(insert(SalesDailyRollup).from_select(
+            ["sale_date_day", "product_id", "category_id", "revenue"],
+            select(func.date(Sale.sale_date), Sale.product_id, Sale.category_id, func.sum(Sale.revenue))
+            .where(Sale.product_id.is_not(None), Sale.category_id.is_not(None))
+            .group_by(func.date(Sale.sale_date), Sale.product_id, Sale.category_id)
+        ))
+
+    # Refresh planner statistics so the indexes above are used
+    connection.execute(text("ANALYZE"))
+
+# Prebuilt statements for the hottest lookups, reused across requests
+inventory_by_product_query = select(Inventory).where(Inventory.product_id == bindparam("product_id"))
+
+# Build the sales listing statement for one combination of optional filters
+def build_sales_query(has_start_date: bool, has_end_date: bool, has_product_id: bool, has_category_id: bool):
+    sales_query = select(Sale.id, Sale.product_id, Sale.quantity, Sale.revenue, Sale.sale_date)
+    
+    if has_start_date:
+        sales_query = sales_query.where(Sale.sale_date >= bindparam("start_date", type_=DateTime))
+    if has_end_date:
+        sales_query = sales_query.where(Sale.sale_date <= bindparam("end_date", type_=DateTime))
+    if has_product_id:
+        sales_query = sales_query.where(Sale.product_id == bindparam("product_id", type_=Integer))
+    if has_category_id:
+        sales_query = sales_query.where(Sale.category_id == bindparam("category_id", type_=Integer))
+    
+    return sales_query
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+# Every sales filter combination, keyed by which of (start_date, end_date, product_id, category_id) are set
+sales_queries = {filters: build_sales_query(*filters) for filters in itertools.product((False, True), repeat=4)}
 
 # Dependency to get the database session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Example request bodies
 
@@ -147,167 +318,231 @@ example_sale = {
 }
 
 example_inventory_update_body = {
-    "stock_quantity": 50,
-    "category_id": 1
+    "stock_quantity": 50
 }
 
 # Product Endpoints
 
 # Create a product
 @app.post("/products/", response_model=ProductResponse)
-def create_product(
+async def create_product(
     product: ProductCreate = Body(example_product, title="Product Data"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_product = Product(**product.dict())
+    db_product = Product(**product.model_dump())
     db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
+    await db.commit()
     return db_product
 
+# Create several products at once
+@app.post("/products/bulk", response_model=List[ProductResponse])
+async def create_products(
+    products: List[ProductCreate] = Body([example_product], title="Product Data", min_length=1),
+    db: AsyncSession = Depends(get_db)
+):
+    db_products = (await db.execute(
+        insert(Product).returning(Product.id, Product.name, Product.description, Product.price, sort_by_parameter_order=True),
+        [product.model_dump() for product in products]
+    )).mappings().all()
+    await db.commit()
+    return db_products
+
 # Retrieve a product by ID
 @app.get("/products/{product_id}", response_model=ProductResponse)
-def read_product(
+async def read_product(
     product_id: int = Path(..., title="The ID of the product to retrieve"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = await db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 # Retrieve all products
-@app.get("/products/", response_model=List[ProductResponse])
-def get_all_products(db: Session = Depends(get_db)):
-    products = db.query(Product).all()
+# Read-only list endpoints select plain columns and return row mappings, skipping ORM object
+# materialization and the identity map entirely.
+@app.get("/products/", response_model=List[ProductListResponse])
+async def get_all_products(db: AsyncSession = Depends(get_db)):
+    products = (await db.execute(select(Product.id, Product.name, Product.price))).mappings().all()
     return products
 
 # Sale Endpoints
 
+# Add recorded sales to the daily revenue rollup in the current transaction
+async def add_sales_to_daily_rollup(db: AsyncSession, sales: List[dict]):
+    rollup_insert = sqlite_insert(SalesDailyRollup)
+    await db.execute(
+        rollup_insert.on_conflict_do_update(
+            index_elements=["sale_date_day", "product_id", "category_id"],
+            set_={"revenue": SalesDailyRollup.revenue + rollup_insert.excluded.revenue},
+        ),
+        [
+            {
+                "sale_date_day": sale["sale_date"].date(),
+                "product_id": sale["product_id"],
+                "category_id": sale["category_id"],
+                "revenue": sale["revenue"],
+            }
+            for sale in sales
+        ]
+    )
+
 # Create a sale
 @app.post("/sales/", response_model=SaleResponse)
-def create_sale(
+async def create_sale(
     sale: SaleCreate = Body(example_sale, title="Sale Data"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_sale = Sale(**sale.dict())
+    sale_data = sale.model_dump()
+    db_sale = Sale(**sale_data)
     db.add(db_sale)
-    db.commit()
-    db.refresh(db_sale)
+    await db.flush()
+    await add_sales_to_daily_rollup(db, [{**sale_data, "sale_date": db_sale.sale_date}])
+    await db.commit()
+    await invalidate_revenue_cache()
     return db_sale
 
+# Record several sales at once
+@app.post("/sales/bulk", response_model=List[SaleResponse])
+async def create_sales(
+    sales: List[SaleCreate] = Body([example_sale], title="Sale Data", min_length=1),
+    db: AsyncSession = Depends(get_db)
+):
+    db_sales = (await db.execute(
+        insert(Sale).returning(Sale.id, Sale.product_id, Sale.quantity, Sale.revenue, Sale.sale_date, Sale.category_id, sort_by_parameter_order=True),
+        [sale.model_dump() for sale in sales]
+    )).mappings().all()
+    await add_sales_to_daily_rollup(db, db_sales)
+    await db.commit()
+    await invalidate_revenue_cache()
+    return db_sales
+
 # Retrieve sales data based on query parameters
 @app.get("/sales/", response_model=List[SaleResponse])
-def get_sales(
+async def get_sales(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     product_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    sales_query = db.query(Sale)
-    
-    if start_date:
-        sales_query = sales_query.filter(Sale.sale_date >= start_date)
-    if end_date:
-        sales_query = sales_query.filter(Sale.sale_date <= end_date)
-    if product_id:
-        sales_query = sales_query.filter(Sale.product_id == product_id)
-    if category_id:
-        sales_query = sales_query.filter(Sale.category_id == category_id)
+    sales_query = sales_queries[(bool(start_date), bool(end_date), bool(product_id), bool(category_id))]
     
-    sales = sales_query.all()
+    sales = (await db.execute(sales_query, {
+        "start_date": start_date,
+        "end_date": end_date,
+        "product_id": product_id,
+        "category_id": category_id,
+    })).mappings().all()
     
     return sales
 
 # Revenue Endpoints
 
-# Calculate revenue for a given period
-def calculate_revenue_for_period(db: Session, params: RevenueQueryParams):
-    revenue = 0.0
-    
-    sales_query = db.query(Sale).filter(Sale.sale_date >= params.start_date, Sale.sale_date <= params.end_date)
-    
-    if params.product_id:
-        sales_query = sales_query.filter(Sale.product_id == params.product_id)
-    
-    if params.category_id:
-        sales_query = sales_query.filter(Sale.category_id == params.category_id)
-    
-    sales = sales_query.all()
-    
-    for sale in sales:
-        revenue += sale.revenue
-    
-    return revenue
+# Build revenue cache keys from the query parameters and the current cache generation only;
+# the per-request db session would make every key unique
+def revenue_key_builder(endpoint, namespace="", *, request=None, response=None, args, kwargs):
+    params = {key: value for key, value in kwargs.items() if key != "db"}
+    params["generation"] = revenue_cache_generation
+    return default_key_builder(endpoint, namespace, request=request, response=response, args=args, kwargs=params)
+
+# fastapi-cache2 advertises "max-age" for the cache lifetime, which would let browsers and proxies keep serving
+# revenue after a new sale clears the server-side cache. Ask them to revalidate against the ETag instead.
+def revalidate_cached_response(endpoint):
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        kwargs["response"].headers["Cache-Control"] = "no-cache"
+        return result
+    return wrapper
+
+# Build the daily, weekly, monthly, and annual revenue windows from the requested dates
+# Every window is derived from the original inputs, and month/year rollover is handled for December
+def get_revenue_windows(start_day: date, end_day: date):
+    next_month = date(start_day.year + start_day.month // 12, start_day.month % 12 + 1, 1)
+    next_year = date(start_day.year + 1, 1, 1)
+    return {
+        "daily": (start_day, end_day),
+        "weekly": (start_day, start_day + timedelta(days=6)),
+        "monthly": (start_day, next_month - timedelta(days=1)),
+        "annual": (start_day, next_year - timedelta(days=1)),
+    }
 
 # Retrieve revenue analysis based on query parameters
 @app.get("/revenue/", response_model=List[RevenueAnalysis])
-def revenue_analysis(
+@revalidate_cached_response
+@cache(expire=REVENUE_CACHE_EXPIRE, namespace=REVENUE_CACHE_NAMESPACE, key_builder=revenue_key_builder)
+async def revenue_analysis(
     start_date: datetime = Query(..., description="Start date for revenue analysis"),
     end_date: datetime = Query(..., description="End date for revenue analysis"),
     product_id: Optional[int] = Query(None, description="Product ID for filtering"),
     category_id: Optional[int] = Query(None, description="Category ID for filtering"),
-    db: Session = Depends(get_db)
+    response: Response = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    revenue_data = []
-
-    # Calculate daily, weekly, monthly, and annual revenue
-    for period in ["daily", "weekly", "monthly", "annual"]:
-        if period == "daily":
-            revenue = calculate_revenue_for_period(db, RevenueQueryParams(start_date=start_date, end_date=end_date, product_id=product_id, category_id=category_id))
-        elif period == "weekly":
-            end_date = start_date + timedelta(days=6)
-            revenue = calculate_revenue_for_period(db, RevenueQueryParams(start_date=start_date, end_date=end_date, product_id=product_id, category_id=category_id))
-        elif period == "monthly":
-            end_date = start_date.replace(day=1, month=start_date.month + 1) - timedelta(days=1)
-            revenue = calculate_revenue_for_period(db, RevenueQueryParams(start_date=start_date, end_date=end_date, product_id=product_id, category_id=category_id))
-        elif period == "annual":
-            end_date = start_date.replace(month=1, day=1, year=start_date.year + 1) - timedelta(days=1)
-            revenue = calculate_revenue_for_period(db, RevenueQueryParams(start_date=start_date, end_date=end_date, product_id=product_id, category_id=category_id))
-
-        revenue_data.append(RevenueAnalysis(period=period, revenue=revenue))
-
-    return revenue_data
+    windows = get_revenue_windows(start_date.date(), end_date.date())
+
+    # Sum every window in a single pass over the daily rollup, bounded to the span covered by all four windows
+    # so the (sale_date_day, category_id, product_id) index serves a range seek rather than a full scan.
+    # The daily window follows end_date and can outlast the annual one, so the span is taken over every window.
+    revenue_query = select(*[
+        func.coalesce(func.sum(case((SalesDailyRollup.sale_date_day.between(window_start, window_end), SalesDailyRollup.revenue), else_=0.0)), 0.0).label(period)
+        for period, (window_start, window_end) in windows.items()
+    ]).where(SalesDailyRollup.sale_date_day.between(
+        min(window_start for window_start, _ in windows.values()),
+        max(window_end for _, window_end in windows.values()),
+    ))
+
+    if product_id:
+        revenue_query = revenue_query.where(SalesDailyRollup.product_id == product_id)
+    if category_id:
+        revenue_query = revenue_query.where(SalesDailyRollup.category_id == category_id)
+
+    revenue = (await db.execute(revenue_query)).mappings().one()
+
+    return [RevenueAnalysis(period=period, revenue=revenue[period]) for period in windows]
 
 # Inventory Endpoints
 
 # Update inventory levels for a product
 @app.put("/inventory/{product_id}", response_model=InventoryResponse)
-def update_inventory(
+async def update_inventory(
     product_id: int = Path(..., title="The ID of the product to update inventory for"),
-    stock_quantity: int = Body(example_inventory_update_body, title="Inventory Update Data"),
-    db: Session = Depends(get_db)
+    inventory_update: InventoryUpdate = Body(example_inventory_update_body, title="Inventory Update Data"),
+    db: AsyncSession = Depends(get_db)
 ):
     # Validate stock_quantity is a positive integer
-    if not isinstance(stock_quantity, int) or stock_quantity <= 0:
+    if inventory_update.stock_quantity <= 0:
         raise HTTPException(status_code=400, detail="stock_quantity should be a positive integer")
 
-    inventory = db.query(Inventory).filter(Inventory.product_id == product_id).first()
+    # Update and read back the row in a single statement
+    inventory = (await db.execute(
+        update(Inventory)
+        .where(Inventory.product_id == product_id)
+        .values(stock_quantity=inventory_update.stock_quantity, last_updated=func.now())
+        .returning(Inventory.id, Inventory.product_id, Inventory.stock_quantity, Inventory.last_updated)
+    )).mappings().first()
     
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventory not found")
     
-    inventory.stock_quantity = stock_quantity
-    inventory.last_updated = datetime.utcnow()
-    db.commit()
-    db.refresh(inventory)
+    await db.commit()
     
     return inventory
 
 # Retrieve all inventory items
 @app.get("/inventory/", response_model=List[InventoryResponse])
-def get_all_inventory_items(db: Session = Depends(get_db)):
-    inventory_items = db.query(Inventory).all()
+async def get_all_inventory_items(db: AsyncSession = Depends(get_db)):
+    inventory_items = (await db.execute(select(Inventory.id, Inventory.product_id, Inventory.stock_quantity, Inventory.last_updated))).mappings().all()
     return inventory_items
 
 # Retrieve inventory of a specific product by ID
 @app.get("/inventory/{product_id}", response_model=InventoryResponse)
-def get_inventory_by_product_id(
+async def get_inventory_by_product_id(
     product_id: int = Path(..., title="The ID of the product to retrieve inventory for"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    inventory = db.query(Inventory).filter(Inventory.product_id == product_id).first()
+    inventory = (await db.execute(inventory_by_product_query, {"product_id": product_id})).scalars().first()
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventory not found for this product")
     return inventory
@@ -317,49 +552,47 @@ def get_inventory_by_product_id(
 
 # Create a category
 @app.post("/categories/", response_model=CategoryResponse)
-def create_category(
+async def create_category(
     category: CategoryCreate = Body(..., title="Category Data"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_category = Category(**category.dict())
+    db_category = Category(**category.model_dump())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
     return db_category
 
 # Retrieve a category by ID
 @app.get("/categories/{category_id}", response_model=CategoryResponse)
-def read_category(
+async def read_category(
     category_id: int = Path(..., title="The ID of the category to retrieve"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
 
 # Update a category
 @app.put("/categories/{category_id}", response_model=CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int = Path(..., title="The ID of the category to update"),
     category: CategoryCreate = Body(..., title="Category Data"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_category = db.query(Category).filter(Category.id == category_id).first()
+    db_category = await db.get(Category, category_id)
     if not db_category:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    for key, value in category.dict().items():
+    for key, value in category.model_dump().items():
         setattr(db_category, key, value)
 
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
     return db_category
 
 # Retrieve all categories
 @app.get("/categories/", response_model=List[CategoryResponse])
-def get_all_categories(db: Session = Depends(get_db)):
-    categories = db.query(Category).all()
+async def get_all_categories(db: AsyncSession = Depends(get_db)):
+    categories = (await db.execute(select(Category.id, Category.name))).mappings().all()
     return categories
 
 if __name__ == "__main__":